@@ -4,9 +4,16 @@ API Routes
 FastAPI endpoints for the edge finder.
 """
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
+from typing import List, Optional, Dict, Callable, Any, Tuple, ClassVar
+from collections import Counter, OrderedDict, defaultdict
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
+import hashlib
 import logging
 
 from core import (
@@ -23,19 +30,147 @@ router = APIRouter()
 # =============================================================================
 # Simple in-memory storage. In production, use Redis or a database.
 
+def _group_by(rows: List, key: Callable[[Any], Any]) -> Dict[Any, List]:
+    """Group rows by key, preserving their original order within each group."""
+    groups = defaultdict(list)
+    for row in rows:
+        groups[key(row)].append(row)
+    return dict(groups)
+
+
+def _at_least(sorted_rows: List, sorted_keys: List[float], cutoff: float) -> List:
+    """Rows whose key is >= cutoff, given rows sorted ascending by that key."""
+    return sorted_rows[bisect_left(sorted_keys, cutoff):]
+
+
+@dataclass(frozen=True)
+class StoreSnapshot:
+    """
+    One published generation of store data plus its derived indexes.
+    
+    Built whole by build() and never mutated afterwards (only its response
+    cache fills in). Handlers read store.snapshot once and use only that, so
+    a refresh publishing a new snapshot can't mix old rows with new indexes.
+    """
+    markets: List[Market]
+    opportunities: List[EdgeOpportunity]
+    predictions: List[Prediction]
+    last_updated: Optional[datetime]
+    version: int
+    
+    markets_by_id: Dict[str, Market]
+    markets_by_category: Dict[MarketCategory, List[Market]]
+    markets_sorted_by_score: List[Market]
+    market_scores: List[float]
+    markets_sorted_by_volume: List[Market]
+    market_volumes: List[float]
+    market_positions: Dict[int, int]
+    opps_by_type: Dict[str, List[EdgeOpportunity]]
+    opps_by_risk: Dict[str, List[EdgeOpportunity]]
+    preds_by_direction: Dict[str, List[Prediction]]
+    predictions_sorted_by_abs_edge: List[Prediction]
+    prediction_abs_edges: List[float]
+    prediction_positions: Dict[int, int]
+    category_counts: Dict[str, int]
+    high_conf_count: int
+    
+    # Serialized list responses for this snapshot, least recently used first
+    responses: "OrderedDict[tuple, Tuple[bytes, str]]" = field(default_factory=OrderedDict)
+    
+    RESPONSE_CACHE_SIZE: ClassVar[int] = 256
+    
+    @classmethod
+    def build(
+        cls,
+        markets: List[Market],
+        opportunities: List[EdgeOpportunity],
+        predictions: List[Prediction],
+        last_updated: Optional[datetime],
+        version: int
+    ) -> "StoreSnapshot":
+        """Compute every index and aggregate for the given data lists."""
+        markets_sorted_by_score = sorted(markets, key=lambda m: m.edge_score)
+        markets_sorted_by_volume = sorted(markets, key=lambda m: m.volume_24h)
+        predictions_sorted_by_abs_edge = sorted(predictions, key=lambda p: abs(p.edge))
+        return cls(
+            markets=markets,
+            opportunities=opportunities,
+            predictions=predictions,
+            last_updated=last_updated,
+            version=version,
+            # Reversed so the first market wins on duplicate IDs, as with a scan
+            markets_by_id={m.market_id: m for m in reversed(markets)},
+            markets_by_category=_group_by(markets, lambda m: m.category),
+            # Ascending copies so min_score / min_volume cutoffs are a bisect
+            markets_sorted_by_score=markets_sorted_by_score,
+            market_scores=[m.edge_score for m in markets_sorted_by_score],
+            markets_sorted_by_volume=markets_sorted_by_volume,
+            market_volumes=[m.volume_24h for m in markets_sorted_by_volume],
+            market_positions={id(m): i for i, m in enumerate(markets)},
+            opps_by_type=_group_by(opportunities, lambda o: o.edge_type.value),
+            opps_by_risk=_group_by(opportunities, lambda o: o.risk_level),
+            preds_by_direction=_group_by(predictions, lambda p: p.direction),
+            predictions_sorted_by_abs_edge=predictions_sorted_by_abs_edge,
+            prediction_abs_edges=[abs(p.edge) for p in predictions_sorted_by_abs_edge],
+            prediction_positions={id(p): i for i, p in enumerate(predictions)},
+            category_counts=dict(Counter(m.category.value for m in markets)),
+            high_conf_count=sum(1 for o in opportunities if o.confidence >= 70),
+        )
+    
+    def cached_response(self, key: tuple) -> Optional[Tuple[bytes, str]]:
+        """Return the cached (body, etag) for a response key, if any."""
+        entry = self.responses.get(key)
+        if entry is not None:
+            self.responses.move_to_end(key)
+        return entry
+    
+    def cache_response(self, key: tuple, body: bytes) -> Tuple[bytes, str]:
+        """Cache a serialized response body under key, tagged with its ETag."""
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        self.responses[key] = (body, etag)
+        while len(self.responses) > self.RESPONSE_CACHE_SIZE:
+            self.responses.popitem(last=False)
+        return body, etag
+
+
 class DataStore:
     """Simple in-memory data store."""
     
     def __init__(self):
-        self.markets: List[Market] = []
-        self.opportunities: List[EdgeOpportunity] = []
-        self.predictions: List[Prediction] = []
-        self.last_updated: Optional[datetime] = None
+        self.snapshot = StoreSnapshot.build([], [], [], None, 0)
         self.is_loading: bool = False
+    
+    def rebuild(
+        self,
+        markets: List[Market],
+        opportunities: List[EdgeOpportunity],
+        predictions: List[Prediction]
+    ):
+        """Publish new data lists, with fresh indexes, as one snapshot."""
+        snapshot = StoreSnapshot.build(
+            markets, opportunities, predictions,
+            last_updated=datetime.now(),
+            version=self.snapshot.version + 1
+        )
+        # Single assignment: readers see either the old or the new snapshot
+        self.snapshot = snapshot
 
 store = DataStore()
 orchestrator = AgentOrchestrator()
 
+# Serializers for the cached list endpoints
+MARKET_LIST = TypeAdapter(List[Market])
+OPPORTUNITY_LIST = TypeAdapter(List[EdgeOpportunity])
+PREDICTION_LIST = TypeAdapter(List[Prediction])
+
+
+def _json_response(request: Request, cached: Tuple[bytes, str]) -> Response:
+    """Serve a cached JSON body, or 304 if the client already has it."""
+    body, etag = cached
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 
 # =============================================================================
 # DASHBOARD
@@ -44,33 +179,26 @@ orchestrator = AgentOrchestrator()
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats():
     """Get summary statistics for the dashboard."""
-    
-    # Count markets by category
-    category_counts = {}
-    for market in store.markets:
-        cat = market.category.value
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-    
-    # Count high-confidence opportunities (>70%)
-    high_conf = sum(1 for o in store.opportunities if o.confidence >= 70)
-    
+    # Aggregates are precomputed whenever a snapshot is built
+    snap = store.snapshot
     return DashboardStats(
-        total_markets=len(store.markets),
-        total_opportunities=len(store.opportunities),
-        high_confidence_opps=high_conf,
-        total_predictions=len(store.predictions),
-        markets_by_category=category_counts,
-        last_updated=store.last_updated
+        total_markets=len(snap.markets),
+        total_opportunities=len(snap.opportunities),
+        high_confidence_opps=snap.high_conf_count,
+        total_predictions=len(snap.predictions),
+        markets_by_category=snap.category_counts,
+        last_updated=snap.last_updated
     )
 
 
 @router.get("/status")
 async def get_status():
     """Get current loading status."""
+    snap = store.snapshot
     return {
         "is_loading": store.is_loading,
-        "markets_loaded": len(store.markets),
-        "last_updated": store.last_updated
+        "markets_loaded": len(snap.markets),
+        "last_updated": snap.last_updated
     }
 
 
@@ -80,6 +208,7 @@ async def get_status():
 
 @router.get("/markets", response_model=List[Market])
 async def get_markets(
+    request: Request,
     category: Optional[MarketCategory] = None,
     min_score: float = Query(0, ge=0, le=100),
     min_volume: float = Query(0, ge=0),
@@ -95,9 +224,32 @@ async def get_markets(
     - **limit**: Max results (default 50)
     - **offset**: Pagination offset
     """
-    markets = store.markets
+    snap = store.snapshot
+    key = ("markets", category, min_score, min_volume, limit, offset)
+    cached = snap.cached_response(key)
+    if cached is None:
+        markets = _filter_markets(snap, category, min_score, min_volume)
+        cached = snap.cache_response(key, MARKET_LIST.dump_json(markets[offset:offset + limit]))
+    return _json_response(request, cached)
+
+
+def _filter_markets(
+    snap: StoreSnapshot,
+    category: Optional[MarketCategory],
+    min_score: float,
+    min_volume: float
+) -> List[Market]:
+    """Apply the /markets filters, returning matches in store order."""
+    # Start from the narrowest index, then apply the remaining filters
+    candidates = [snap.markets]
+    if category:
+        candidates.append(snap.markets_by_category.get(category, []))
+    if min_score > 0:
+        candidates.append(_at_least(snap.markets_sorted_by_score, snap.market_scores, min_score))
+    if min_volume > 0:
+        candidates.append(_at_least(snap.markets_sorted_by_volume, snap.market_volumes, min_volume))
+    markets = min(candidates, key=len)
     
-    # Apply filters
     if category:
         markets = [m for m in markets if m.category == category]
     if min_score > 0:
@@ -105,17 +257,21 @@ async def get_markets(
     if min_volume > 0:
         markets = [m for m in markets if m.volume_24h >= min_volume]
     
-    # Paginate
-    return markets[offset:offset + limit]
+    # Sorted indexes lose the store order, so restore it before paginating
+    if min_score > 0 or min_volume > 0:
+        positions = snap.market_positions
+        markets.sort(key=lambda m: positions[id(m)])
+    
+    return markets
 
 
 @router.get("/markets/{market_id}", response_model=Market)
 async def get_market(market_id: str):
     """Get a specific market by ID."""
-    for market in store.markets:
-        if market.market_id == market_id:
-            return market
-    raise HTTPException(status_code=404, detail="Market not found")
+    market = store.snapshot.markets_by_id.get(market_id)
+    if market is None:
+        raise HTTPException(status_code=404, detail="Market not found")
+    return market
 
 
 # =============================================================================
@@ -124,6 +280,7 @@ async def get_market(market_id: str):
 
 @router.get("/opportunities", response_model=List[EdgeOpportunity])
 async def get_opportunities(
+    request: Request,
     edge_type: Optional[str] = None,
     min_confidence: float = Query(0, ge=0, le=100),
     risk_level: Optional[str] = None,
@@ -137,7 +294,28 @@ async def get_opportunities(
     - **risk_level**: Filter by risk (low, medium, high)
     - **limit**: Max results
     """
-    opps = store.opportunities
+    snap = store.snapshot
+    key = ("opportunities", edge_type, min_confidence, risk_level, limit)
+    cached = snap.cached_response(key)
+    if cached is None:
+        opps = _filter_opportunities(snap, edge_type, min_confidence, risk_level)
+        cached = snap.cache_response(key, OPPORTUNITY_LIST.dump_json(opps[:limit]))
+    return _json_response(request, cached)
+
+
+def _filter_opportunities(
+    snap: StoreSnapshot,
+    edge_type: Optional[str],
+    min_confidence: float,
+    risk_level: Optional[str]
+) -> List[EdgeOpportunity]:
+    """Apply the /opportunities filters, returning matches in store order."""
+    candidates = [snap.opportunities]
+    if edge_type:
+        candidates.append(snap.opps_by_type.get(edge_type, []))
+    if risk_level:
+        candidates.append(snap.opps_by_risk.get(risk_level, []))
+    opps = min(candidates, key=len)
     
     if edge_type:
         opps = [o for o in opps if o.edge_type.value == edge_type]
@@ -146,7 +324,7 @@ async def get_opportunities(
     if risk_level:
         opps = [o for o in opps if o.risk_level == risk_level]
     
-    return opps[:limit]
+    return opps
 
 
 # =============================================================================
@@ -155,6 +333,7 @@ async def get_opportunities(
 
 @router.get("/predictions", response_model=List[Prediction])
 async def get_predictions(
+    request: Request,
     direction: Optional[str] = None,
     min_edge: float = Query(0, ge=0, le=1),
     limit: int = Query(50, ge=1, le=200)
@@ -166,14 +345,38 @@ async def get_predictions(
     - **min_edge**: Minimum absolute edge
     - **limit**: Max results
     """
-    preds = store.predictions
+    snap = store.snapshot
+    key = ("predictions", direction, min_edge, limit)
+    cached = snap.cached_response(key)
+    if cached is None:
+        preds = _filter_predictions(snap, direction, min_edge)
+        cached = snap.cache_response(key, PREDICTION_LIST.dump_json(preds[:limit]))
+    return _json_response(request, cached)
+
+
+def _filter_predictions(
+    snap: StoreSnapshot,
+    direction: Optional[str],
+    min_edge: float
+) -> List[Prediction]:
+    """Apply the /predictions filters, returning matches in store order."""
+    candidates = [snap.predictions]
+    if direction:
+        candidates.append(snap.preds_by_direction.get(direction, []))
+    if min_edge > 0:
+        candidates.append(_at_least(
+            snap.predictions_sorted_by_abs_edge, snap.prediction_abs_edges, min_edge
+        ))
+    preds = min(candidates, key=len)
     
     if direction:
         preds = [p for p in preds if p.direction == direction]
     if min_edge > 0:
         preds = [p for p in preds if abs(p.edge) >= min_edge]
+        positions = snap.prediction_positions
+        preds.sort(key=lambda p: positions[id(p)])
     
-    return preds[:limit]
+    return preds
 
 
 # =============================================================================
@@ -187,25 +390,28 @@ def _refresh_data_task(max_markets: int, min_volume: float, fetch_orderbooks: bo
     try:
         # 1. Ingest markets
         logger.info("Ingesting markets...")
-        store.markets = ingest_markets(
+        markets = ingest_markets(
             max_markets=max_markets,
             min_volume=min_volume,
             fetch_orderbooks=fetch_orderbooks
         )
         
-        # 2. Detect edges
-        logger.info("Detecting edges...")
-        store.opportunities = detect_all_edges(store.markets)
-        
-        # 3. Run research agents
-        logger.info("Running research agents...")
-        store.predictions = orchestrator.research_markets(
-            store.markets[:50],  # Top 50 by edge score
-            min_edge=0.0
-        )
+        # 2-3. Detect edges and run research agents. Both only read the
+        # ingested markets, so they run side by side.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            logger.info("Detecting edges and running research agents...")
+            opportunities = pool.submit(detect_all_edges, markets)
+            predictions = pool.submit(
+                orchestrator.research_markets,
+                markets[:50],  # Top 50 by edge score
+                min_edge=0.0
+            )
+            opportunities = opportunities.result()
+            predictions = predictions.result()
         
-        store.last_updated = datetime.now()
-        logger.info(f"Refresh complete: {len(store.markets)} markets, {len(store.opportunities)} opportunities")
+        # Publish only once everything succeeded
+        store.rebuild(markets, opportunities, predictions)
+        logger.info(f"Refresh complete: {len(markets)} markets, {len(opportunities)} opportunities")
         
     except Exception as e:
         logger.error(f"Refresh failed: {e}")
@@ -213,9 +419,12 @@ def _refresh_data_task(max_markets: int, min_volume: float, fetch_orderbooks: bo
         store.is_loading = False
 
 
+# Strong references to running refreshes so they aren't garbage collected
+_refresh_tasks = set()
+
+
 @router.post("/refresh")
 async def refresh_data(
-    background_tasks: BackgroundTasks,
     max_markets: int = Query(100, ge=10, le=500),
     min_volume: float = Query(500, ge=0),
     fetch_orderbooks: bool = Query(True)
@@ -230,12 +439,19 @@ async def refresh_data(
     if store.is_loading:
         raise HTTPException(status_code=409, detail="Refresh already in progress")
     
-    background_tasks.add_task(
+    # Flag before scheduling so a second request can't slip in
+    store.is_loading = True
+    
+    # The refresh blocks on HTTP for minutes; run it on its own thread
+    # instead of holding one of the request threadpool's workers
+    task = asyncio.create_task(asyncio.to_thread(
         _refresh_data_task,
         max_markets,
         min_volume,
         fetch_orderbooks
-    )
+    ))
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
     
     return {"message": "Refresh started", "max_markets": max_markets}
 
@@ -250,7 +466,7 @@ async def load_demo_data():
     
     from core.models import Token
     
-    store.markets = [
+    markets = [
         Market(
             market_id="demo-1",
             question="Will Bitcoin reach $100,000 by March 2025?",
@@ -357,7 +573,7 @@ async def load_demo_data():
     ]
     
     # Generate opportunities
-    store.opportunities = [
+    opportunities = [
         EdgeOpportunity(
             id="opp-1",
             edge_type="arbitrage",
@@ -397,7 +613,7 @@ async def load_demo_data():
     ]
     
     # Generate predictions
-    store.predictions = [
+    predictions = [
         Prediction(
             market_id="demo-1",
             market_question="Will Bitcoin reach $100,000 by March 2025?",
@@ -432,11 +648,11 @@ async def load_demo_data():
         ),
     ]
     
-    store.last_updated = datetime.now()
+    store.rebuild(markets, opportunities, predictions)
     
     return {
         "message": "Demo data loaded",
-        "markets": len(store.markets),
-        "opportunities": len(store.opportunities),
-        "predictions": len(store.predictions)
+        "markets": len(markets),
+        "opportunities": len(opportunities),
+        "predictions": len(predictions)
     }
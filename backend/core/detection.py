@@ -5,22 +5,121 @@ Identifies trading opportunities in market data.
 """
 
 import re
-import uuid
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from typing import List, Dict, Optional
 from collections import defaultdict
 from datetime import datetime
 import logging
 
+import numpy as np
+
 from .models import Market, EdgeOpportunity, EdgeType
 
 logger = logging.getLogger(__name__)
 
+# Process-local opportunity IDs; only need to be unique within the store
+_opportunity_ids = count(1)
+
+
+def _next_id() -> str:
+    """Return a short unique ID for a new opportunity."""
+    return f"opp-{next(_opportunity_ids):x}"
+
+
+# =============================================================================
+# MARKET ARRAYS
+# =============================================================================
+
+class MarketArrays:
+    """
+    Struct-of-arrays view of a list of markets.
+    
+    Built in a single pass over the Market models. Detectors evaluate their
+    thresholds as vectorized masks over the numeric columns and read the
+    survivors' IDs and questions from the plain columns rather than going
+    back to the models. Index i in every column refers to markets[i].
+    """
+    
+    __slots__ = (
+        "markets", "market_ids", "questions", "end_dates",
+        "yes_price", "no_price", "is_binary", "n_tokens", "is_multi", "token_sum",
+        "current_price", "spread_pct", "volume_24h", "liquidity",
+    )
+    
+    def __init__(self, markets: List[Market]):
+        self.markets = markets
+        self.market_ids: List[str] = []
+        self.questions: List[str] = []
+        self.end_dates: List[Optional[str]] = []
+        
+        yes_prices, no_prices, token_counts, token_sums = [], [], [], []
+        prices, spreads, volumes, liquidities = [], [], [], []
+        for market in markets:
+            self.market_ids.append(market.market_id)
+            self.questions.append(market.question)
+            self.end_dates.append(market.end_date)
+            
+            tokens = market.tokens
+            yes_token = no_token = None
+            if len(tokens) == 2:
+                yes_token = market.tokens_by_outcome.get("Yes")
+                no_token = market.tokens_by_outcome.get("No")
+            
+            if yes_token and no_token:
+                yes_prices.append(yes_token.price)
+                no_prices.append(no_token.price)
+            else:
+                yes_prices.append(np.nan)
+                no_prices.append(np.nan)
+            
+            token_counts.append(len(tokens))
+            token_sums.append(sum(t.price for t in tokens))
+            
+            prices.append(market.current_price)
+            spreads.append(market.spread_pct)
+            volumes.append(market.volume_24h)
+            liquidities.append(market.liquidity)
+        
+        # NaN YES/NO prices mark markets without a Yes/No token pair
+        self.yes_price = np.array(yes_prices, dtype=np.float64)
+        self.no_price = np.array(no_prices, dtype=np.float64)
+        self.is_binary = ~np.isnan(self.yes_price)
+        self.n_tokens = np.array(token_counts, dtype=np.int64)
+        self.is_multi = self.n_tokens > 2
+        self.token_sum = np.array(token_sums, dtype=np.float64)
+        
+        self.current_price = np.array(prices, dtype=np.float64)
+        self.spread_pct = np.array(spreads, dtype=np.float64)
+        self.volume_24h = np.array(volumes, dtype=np.float64)
+        self.liquidity = np.array(liquidities, dtype=np.float64)
+
 
 # =============================================================================
 # ARBITRAGE DETECTION
 # =============================================================================
 
-def detect_binary_mispricing(markets: List[Market]) -> List[EdgeOpportunity]:
+def _binary_mispricing_kernel(yes: np.ndarray, no: np.ndarray):
+    """
+    Vectorized core of binary mispricing detection.
+    
+    Returns (under_idx, under_ret, over_idx): indices of underpriced
+    markets with their expected return after fees, and indices of
+    overpriced markets. NaN prices never match.
+    """
+    total = yes + no
+    with np.errstate(divide="ignore", invalid="ignore"):
+        under_ret = ((1.0 - total) / total) * 100 - 2  # Minus ~2% fees
+    
+    under_idx = np.flatnonzero((total < 0.97) & (total > 0) & (under_ret > 1))
+    over_idx = np.flatnonzero(total > 1.04)
+    return under_idx, under_ret[under_idx], over_idx
+
+
+def detect_binary_mispricing(
+    markets: List[Market],
+    arrays: Optional[MarketArrays] = None
+) -> List[EdgeOpportunity]:
     """
     Find binary markets where YES + NO != 1.00
     
@@ -28,86 +127,88 @@ def detect_binary_mispricing(markets: List[Market]) -> List[EdgeOpportunity]:
     If sum > 1.04: One side is overpriced
     """
     opportunities = []
+    if arrays is None:
+        arrays = MarketArrays(markets)
     
-    for market in markets:
-        if len(market.tokens) != 2:
-            continue
-        
-        yes_token = next((t for t in market.tokens if t.outcome == "Yes"), None)
-        no_token = next((t for t in market.tokens if t.outcome == "No"), None)
-        
-        if not yes_token or not no_token:
-            continue
-        
-        total = yes_token.price + no_token.price
+    under_idx, under_ret, over_idx = _binary_mispricing_kernel(arrays.yes_price, arrays.no_price)
+    
+    # Underpriced - arbitrage opportunity
+    for i, expected_return in zip(under_idx.tolist(), under_ret.tolist()):
+        yes_price = float(arrays.yes_price[i])
+        no_price = float(arrays.no_price[i])
+        total = yes_price + no_price
         
-        # Underpriced - arbitrage opportunity
-        if total < 0.97:
-            expected_return = ((1.0 - total) / total) * 100 - 2  # Minus ~2% fees
-            if expected_return > 1:
-                opportunities.append(EdgeOpportunity(
-                    id=str(uuid.uuid4())[:8],
-                    edge_type=EdgeType.ARBITRAGE,
-                    description=f"Binary underpricing: YES ({yes_token.price:.1%}) + NO ({no_token.price:.1%}) = {total:.1%}",
-                    confidence=90,
-                    expected_return=expected_return,
-                    risk_level="low",
-                    market_id=market.market_id,
-                    market_question=market.question,
-                    suggested_action=f"Buy both YES at {yes_token.price:.2%} and NO at {no_token.price:.2%}",
-                    reasoning=f"Combined price {total:.1%} < 1.00 means guaranteed profit after fees"
-                ))
+        opportunities.append(EdgeOpportunity.model_construct(
+            id=_next_id(),
+            edge_type=EdgeType.ARBITRAGE,
+            description=f"Binary underpricing: YES ({yes_price:.1%}) + NO ({no_price:.1%}) = {total:.1%}",
+            confidence=90.0,
+            expected_return=expected_return,
+            risk_level="low",
+            market_id=arrays.market_ids[i],
+            market_question=arrays.questions[i],
+            suggested_action=f"Buy both YES at {yes_price:.2%} and NO at {no_price:.2%}",
+            reasoning=f"Combined price {total:.1%} < 1.00 means guaranteed profit after fees"
+        ))
+    
+    # Overpriced - indicates mispricing
+    for i in over_idx.tolist():
+        yes_price = float(arrays.yes_price[i])
+        no_price = float(arrays.no_price[i])
+        total = yes_price + no_price
         
-        # Overpriced - indicates mispricing
-        elif total > 1.04:
-            opportunities.append(EdgeOpportunity(
-                id=str(uuid.uuid4())[:8],
-                edge_type=EdgeType.MISPRICING,
-                description=f"Binary overpricing: Sum = {total:.1%}",
-                confidence=70,
-                expected_return=(total - 1.0) * 100 / 2,
-                risk_level="medium",
-                market_id=market.market_id,
-                market_question=market.question,
-                suggested_action="Identify and sell the overpriced side",
-                reasoning=f"YES ({yes_token.price:.1%}) + NO ({no_token.price:.1%}) = {total:.1%} > 1.00"
-            ))
+        opportunities.append(EdgeOpportunity.model_construct(
+            id=_next_id(),
+            edge_type=EdgeType.MISPRICING,
+            description=f"Binary overpricing: Sum = {total:.1%}",
+            confidence=70.0,
+            expected_return=(total - 1.0) * 100 / 2,
+            risk_level="medium",
+            market_id=arrays.market_ids[i],
+            market_question=arrays.questions[i],
+            suggested_action="Identify and sell the overpriced side",
+            reasoning=f"YES ({yes_price:.1%}) + NO ({no_price:.1%}) = {total:.1%} > 1.00"
+        ))
     
     return opportunities
 
 
-def detect_multi_outcome_mispricing(markets: List[Market]) -> List[EdgeOpportunity]:
+def detect_multi_outcome_mispricing(
+    markets: List[Market],
+    arrays: Optional[MarketArrays] = None
+) -> List[EdgeOpportunity]:
     """
     Find multi-outcome markets where probabilities don't sum to 1.
     For mutually exclusive outcomes, sum should = 1.00
     """
     opportunities = []
+    if arrays is None:
+        arrays = MarketArrays(markets)
     
-    for market in markets:
-        if len(market.tokens) <= 2:
-            continue
-        
-        total = sum(t.price for t in market.tokens)
+    total = arrays.token_sum
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected_return = ((1.0 - total) / total) * 100 - 2
+    
+    mask = arrays.is_multi & (total < 0.95) & (total > 0) & (expected_return > 2)
+    
+    for i in np.flatnonzero(mask).tolist():
+        total_i = float(total[i])
+        token_summary = ", ".join([
+            f"{t.outcome}: {t.price:.1%}" for t in arrays.markets[i].tokens[:4]
+        ])
         
-        if total < 0.95:
-            expected_return = ((1.0 - total) / total) * 100 - 2
-            if expected_return > 2:
-                token_summary = ", ".join([
-                    f"{t.outcome}: {t.price:.1%}" for t in market.tokens[:4]
-                ])
-                
-                opportunities.append(EdgeOpportunity(
-                    id=str(uuid.uuid4())[:8],
-                    edge_type=EdgeType.ARBITRAGE,
-                    description=f"Multi-outcome underpricing: Sum = {total:.1%}",
-                    confidence=85,
-                    expected_return=expected_return,
-                    risk_level="low",
-                    market_id=market.market_id,
-                    market_question=market.question,
-                    suggested_action="Buy all outcomes proportionally",
-                    reasoning=f"Outcomes: {token_summary}. Total {total:.1%} < 1.00"
-                ))
+        opportunities.append(EdgeOpportunity.model_construct(
+            id=_next_id(),
+            edge_type=EdgeType.ARBITRAGE,
+            description=f"Multi-outcome underpricing: Sum = {total_i:.1%}",
+            confidence=85.0,
+            expected_return=float(expected_return[i]),
+            risk_level="low",
+            market_id=arrays.market_ids[i],
+            market_question=arrays.questions[i],
+            suggested_action="Buy all outcomes proportionally",
+            reasoning=f"Outcomes: {token_summary}. Total {total_i:.1%} < 1.00"
+        ))
     
     return opportunities
 
@@ -116,31 +217,39 @@ def detect_multi_outcome_mispricing(markets: List[Market]) -> List[EdgeOpportuni
 # TEMPORAL ARBITRAGE
 # =============================================================================
 
-def detect_temporal_arbitrage(markets: List[Market]) -> List[EdgeOpportunity]:
+# Date phrases normalized out of questions, fused into a single pattern so
+# each question is scanned once
+_DATE_RE = re.compile(
+    r'\b(?:january|february|march|april|may|june|july|august|september|october|november|december)\b'
+    r'|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\b'
+    r'|\bby\s+\w+\s+\d+'
+    r'|\bbefore\s+\w+'
+)
+
+
+def detect_temporal_arbitrage(
+    markets: List[Market],
+    arrays: Optional[MarketArrays] = None
+) -> List[EdgeOpportunity]:
     """
     Find temporal inconsistencies: "X by March" should be <= "X by June"
     """
     opportunities = []
+    if arrays is None:
+        arrays = MarketArrays(markets)
     
-    # Patterns to normalize dates in questions
-    date_patterns = [
-        r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\b',
-        r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\b',
-        r'\bby\s+\w+\s+\d+',
-        r'\bbefore\s+\w+'
-    ]
-    
-    # Group markets by normalized question
+    # Group market indices by normalized question
     groups = defaultdict(list)
     
-    for market in markets:
-        question = market.question.lower()
-        normalized = question
-        for pattern in date_patterns:
-            normalized = re.sub(pattern, "<DATE>", normalized, flags=re.IGNORECASE)
+    for i, market in enumerate(arrays.markets):
+        normalized = _DATE_RE.sub("<DATE>", market.question_lower)
         
         if "<DATE>" in normalized:
-            groups[normalized].append(market)
+            groups[normalized].append(i)
+    
+    end_dates = arrays.end_dates
+    prices = arrays.current_price.tolist()
+    questions = arrays.questions
     
     # Check each group for temporal violations
     for base_q, group in groups.items():
@@ -150,29 +259,30 @@ def detect_temporal_arbitrage(markets: List[Market]) -> List[EdgeOpportunity]:
         # Sort by end date
         sorted_group = sorted(
             group,
-            key=lambda m: m.end_date or "9999-12-31"
+            key=lambda i: end_dates[i] or "9999-12-31"
         )
         
-        for i in range(len(sorted_group) - 1):
-            earlier = sorted_group[i]
-            later = sorted_group[i + 1]
+        # Earlier deadline should have lower or equal probability; compare
+        # every consecutive pair at once
+        group_prices = arrays.current_price[sorted_group]
+        violations = np.flatnonzero(group_prices[:-1] > group_prices[1:] + 0.03)
+        
+        for k in violations.tolist():
+            earlier, later = sorted_group[k], sorted_group[k + 1]
+            diff = prices[earlier] - prices[later]
             
-            # Earlier deadline should have lower or equal probability
-            if earlier.current_price > later.current_price + 0.03:
-                diff = earlier.current_price - later.current_price
-                
-                opportunities.append(EdgeOpportunity(
-                    id=str(uuid.uuid4())[:8],
-                    edge_type=EdgeType.ARBITRAGE,
-                    description=f"Temporal mispricing: Earlier ({earlier.current_price:.1%}) > Later ({later.current_price:.1%})",
-                    confidence=85,
-                    expected_return=diff * 100,
-                    risk_level="low",
-                    market_id=earlier.market_id,
-                    market_question=earlier.question,
-                    suggested_action=f"Sell YES on earlier market, Buy YES on later market",
-                    reasoning=f"Event by earlier date can't be more likely than by later date. {earlier.question[:50]} vs {later.question[:50]}"
-                ))
+            opportunities.append(EdgeOpportunity.model_construct(
+                id=_next_id(),
+                edge_type=EdgeType.ARBITRAGE,
+                description=f"Temporal mispricing: Earlier ({prices[earlier]:.1%}) > Later ({prices[later]:.1%})",
+                confidence=85.0,
+                expected_return=diff * 100,
+                risk_level="low",
+                market_id=arrays.market_ids[earlier],
+                market_question=questions[earlier],
+                suggested_action=f"Sell YES on earlier market, Buy YES on later market",
+                reasoning=f"Event by earlier date can't be more likely than by later date. {questions[earlier][:50]} vs {questions[later][:50]}"
+            ))
     
     return opportunities
 
@@ -181,57 +291,83 @@ def detect_temporal_arbitrage(markets: List[Market]) -> List[EdgeOpportunity]:
 # VOLUME & LIQUIDITY ANALYSIS
 # =============================================================================
 
-def detect_volume_spikes(markets: List[Market], threshold: float = 3.0) -> List[EdgeOpportunity]:
+def _volume_spike_kernel(volume: np.ndarray, liquidity: np.ndarray, threshold: float):
+    """
+    Vectorized core of volume spike detection.
+    
+    Returns (idx, ratio): indices of markets whose volume/liquidity ratio
+    exceeds threshold, with those ratios. Zero liquidity never matches.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol_liq = np.where(liquidity != 0, volume / liquidity, 0.0)
+    idx = np.flatnonzero(vol_liq > threshold)
+    return idx, vol_liq[idx]
+
+
+def detect_volume_spikes(
+    markets: List[Market],
+    threshold: float = 3.0,
+    arrays: Optional[MarketArrays] = None
+) -> List[EdgeOpportunity]:
     """
     Find markets with unusual volume relative to liquidity.
     High volume often indicates informed trading.
     """
     opportunities = []
+    if arrays is None:
+        arrays = MarketArrays(markets)
     
-    for market in markets:
-        if market.liquidity == 0:
-            continue
-        
-        vol_liq_ratio = market.volume_24h / market.liquidity
+    spike_idx, spike_ratio = _volume_spike_kernel(arrays.volume_24h, arrays.liquidity, threshold)
+    
+    for i, vol_liq_ratio in zip(spike_idx.tolist(), spike_ratio.tolist()):
+        volume = float(arrays.volume_24h[i])
+        liquidity = float(arrays.liquidity[i])
         
-        if vol_liq_ratio > threshold:
-            opportunities.append(EdgeOpportunity(
-                id=str(uuid.uuid4())[:8],
-                edge_type=EdgeType.VOLUME_SIGNAL,
-                description=f"Volume spike: {vol_liq_ratio:.1f}x liquidity",
-                confidence=55,
-                expected_return=0,  # Unknown direction
-                risk_level="high",
-                market_id=market.market_id,
-                market_question=market.question,
-                suggested_action="Research why volume is elevated. Potential informed trading.",
-                reasoning=f"24h volume (${market.volume_24h:,.0f}) is {vol_liq_ratio:.1f}x liquidity (${market.liquidity:,.0f})"
-            ))
+        opportunities.append(EdgeOpportunity.model_construct(
+            id=_next_id(),
+            edge_type=EdgeType.VOLUME_SIGNAL,
+            description=f"Volume spike: {vol_liq_ratio:.1f}x liquidity",
+            confidence=55.0,
+            expected_return=0.0,  # Unknown direction
+            risk_level="high",
+            market_id=arrays.market_ids[i],
+            market_question=arrays.questions[i],
+            suggested_action="Research why volume is elevated. Potential informed trading.",
+            reasoning=f"24h volume (${volume:,.0f}) is {vol_liq_ratio:.1f}x liquidity (${liquidity:,.0f})"
+        ))
     
     return opportunities
 
 
-def detect_liquidity_gaps(markets: List[Market], min_spread: float = 3.0) -> List[EdgeOpportunity]:
+def detect_liquidity_gaps(
+    markets: List[Market],
+    min_spread: float = 3.0,
+    arrays: Optional[MarketArrays] = None
+) -> List[EdgeOpportunity]:
     """
     Find markets with wide spreads where market-making could be profitable.
     """
     opportunities = []
+    if arrays is None:
+        arrays = MarketArrays(markets)
     
-    for market in markets:
-        if market.spread_pct < min_spread or market.volume_24h < 1000:
-            continue
+    mask = (arrays.spread_pct >= min_spread) & (arrays.volume_24h >= 1000)
+    
+    for i in np.flatnonzero(mask).tolist():
+        spread_pct = float(arrays.spread_pct[i])
+        volume = float(arrays.volume_24h[i])
         
-        opportunities.append(EdgeOpportunity(
-            id=str(uuid.uuid4())[:8],
+        opportunities.append(EdgeOpportunity.model_construct(
+            id=_next_id(),
             edge_type=EdgeType.LIQUIDITY_GAP,
-            description=f"Wide spread: {market.spread_pct:.1f}%",
-            confidence=65,
-            expected_return=market.spread_pct / 2,  # Capture half the spread
+            description=f"Wide spread: {spread_pct:.1f}%",
+            confidence=65.0,
+            expected_return=spread_pct / 2,  # Capture half the spread
             risk_level="medium",
-            market_id=market.market_id,
-            market_question=market.question,
+            market_id=arrays.market_ids[i],
+            market_question=arrays.questions[i],
             suggested_action=f"Provide liquidity at tighter spread",
-            reasoning=f"Spread {market.spread_pct:.1f}% with ${market.volume_24h:,.0f} daily volume"
+            reasoning=f"Spread {spread_pct:.1f}% with ${volume:,.0f} daily volume"
         ))
     
     return opportunities
@@ -251,14 +387,27 @@ def detect_all_edges(markets: List[Market]) -> List[EdgeOpportunity]:
     
     logger.info("Running edge detection...")
     
-    # Arbitrage
-    opportunities.extend(detect_binary_mispricing(markets))
-    opportunities.extend(detect_multi_outcome_mispricing(markets))
-    opportunities.extend(detect_temporal_arbitrage(markets))
+    # Single pass over the markets; every detector works off these columns
+    arrays = MarketArrays(markets)
+    
+    detectors = [
+        # Arbitrage
+        detect_binary_mispricing,
+        detect_multi_outcome_mispricing,
+        detect_temporal_arbitrage,
+        # Volume/Liquidity
+        detect_volume_spikes,
+        detect_liquidity_gaps,
+    ]
     
-    # Volume/Liquidity
-    opportunities.extend(detect_volume_spikes(markets))
-    opportunities.extend(detect_liquidity_gaps(markets))
+    # Detectors are independent and share the read-only arrays. Most of their
+    # time is Python-level (building opportunities) and holds the GIL, so the
+    # pool gives little parallelism today; it is set up for detectors that
+    # release the GIL (larger array kernels, I/O). Results keep this order.
+    with ThreadPoolExecutor(max_workers=len(detectors)) as pool:
+        results = pool.map(lambda detect: detect(markets, arrays=arrays), detectors)
+        for found in results:
+            opportunities.extend(found)
     
     # Sort by confidence
     opportunities.sort(key=lambda x: x.confidence, reverse=True)
@@ -6,13 +6,22 @@ Simplified version focused on clarity.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import re
-from typing import List, Dict, Optional
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import zip_longest
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timezone
 import logging
 
-from .models import Market, Token, MarketCategory
+import numpy as np
+import orjson
+
+from .models import Market, MarketCore, TokenCore, MarketCategory
 
 logger = logging.getLogger(__name__)
 
@@ -25,36 +34,99 @@ class PolymarketClient:
     """
     Simple client for Polymarket APIs.
     Handles rate limiting and browser-like headers.
+    
+    Safe to share between threads: the rate limit is global to the client,
+    but requests already in flight overlap their network latency.
+    
+    Rate limiting is a token bucket: RATE_LIMIT requests/second sustained,
+    with up to RATE_BURST requests sent back-to-back after an idle period.
     """
     
     GAMMA_BASE = "https://gamma-api.polymarket.com"
     CLOB_BASE = "https://clob.polymarket.com"
     
+    # Requests allowed in flight at once (also the connection pool size)
+    MAX_CONCURRENCY = 8
+    
+    RATE_LIMIT = 2.0
+    RATE_BURST = 5
+    
+    # Order books younger than this are served from memory
+    ORDERBOOK_TTL = 60.0
+    ORDERBOOK_CACHE_SIZE = 2048
+    
+    # Token ids per POST /books request
+    ORDERBOOK_BATCH_SIZE = 100
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
             "Accept": "application/json",
         })
-        self.last_request = 0
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=self.MAX_CONCURRENCY
+        )
+        self.session.mount("https://", adapter)
+        self._tokens = float(self.RATE_BURST)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+        
+        # token_id -> (fetched_at, etag, book), least recently used first
+        self._orderbooks: "OrderedDict[str, Tuple[float, Optional[str], Dict]]" = OrderedDict()
+        self._orderbooks_lock = threading.Lock()
     
-    def _request(self, url: str, params: Dict = None) -> Optional[Dict]:
-        """Make a rate-limited request."""
-        # Rate limit: 2 requests/second
-        elapsed = time.time() - self.last_request
-        if elapsed < 0.5:
-            time.sleep(0.5 - elapsed)
-        self.last_request = time.time()
+    def _wait_for_slot(self):
+        """Take a token from the rate-limit bucket, sleeping if it is empty."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.RATE_BURST,
+                self._tokens + (now - self._refilled_at) * self.RATE_LIMIT
+            )
+            self._refilled_at = now
+            # A negative balance reserves a future token for this caller
+            self._tokens -= 1
+            wait = -self._tokens / self.RATE_LIMIT
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _get(self, url: str, params: Dict = None, headers: Dict = None) -> Optional[requests.Response]:
+        """Make a rate-limited GET, returning the raw response."""
+        self._wait_for_slot()
         
         try:
-            resp = self.session.get(url, params=params, timeout=15)
-            if resp.status_code == 200:
-                return resp.json()
-            logger.warning(f"Request failed: {resp.status_code}")
+            return self.session.get(url, params=params, headers=headers, timeout=15)
+        except Exception as e:
+            logger.error(f"Request error: {e}")
+        return None
+    
+    def _post(self, url: str, payload) -> Optional[requests.Response]:
+        """Make a rate-limited POST with a JSON body, returning the raw response."""
+        self._wait_for_slot()
+        
+        try:
+            return self.session.post(
+                url,
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=15
+            )
         except Exception as e:
             logger.error(f"Request error: {e}")
         return None
     
+    def _request(self, url: str, params: Dict = None) -> Optional[Dict]:
+        """Make a rate-limited request."""
+        resp = self._get(url, params)
+        if resp is None:
+            return None
+        if resp.status_code == 200:
+            return orjson.loads(resp.content)
+        logger.warning(f"Request failed: {resp.status_code}")
+        return None
+    
     def get_markets(self, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Fetch active markets sorted by volume."""
         url = f"{self.GAMMA_BASE}/markets"
@@ -68,9 +140,109 @@ class PolymarketClient:
         return self._request(url, params) or []
     
     def get_orderbook(self, token_id: str) -> Optional[Dict]:
-        """Fetch order book for a token."""
-        url = f"{self.CLOB_BASE}/book"
-        return self._request(url, {"token_id": token_id})
+        """
+        Fetch order book for a token.
+        
+        Books are cached for ORDERBOOK_TTL seconds. Past that, the request is
+        made conditional on the stored ETag and a 304 reuses the cached book.
+        """
+        with self._orderbooks_lock:
+            cached = self._orderbooks.get(token_id)
+            if cached:
+                self._orderbooks.move_to_end(token_id)
+        
+        if cached and time.monotonic() - cached[0] < self.ORDERBOOK_TTL:
+            return cached[2]
+        
+        headers = {"If-None-Match": cached[1]} if cached and cached[1] else None
+        resp = self._get(f"{self.CLOB_BASE}/book", {"token_id": token_id}, headers)
+        if resp is None:
+            return None
+        
+        if resp.status_code == 304 and cached:
+            book, etag = cached[2], cached[1]
+        elif resp.status_code == 200:
+            book, etag = orjson.loads(resp.content), resp.headers.get("ETag")
+        else:
+            logger.warning(f"Request failed: {resp.status_code}")
+            return None
+        
+        self._cache_orderbook(token_id, etag, book)
+        return book
+    
+    def get_orderbooks(self, token_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch order books for many tokens, keyed by token id.
+        
+        Fresh cached books are reused; the rest are requested in batches
+        from POST /books. Tokens a batch does not return (or a failed batch)
+        fall back to concurrent get_orderbook calls. Tokens with no book are
+        left out of the result.
+        """
+        books = {}
+        missing = []
+        now = time.monotonic()
+        with self._orderbooks_lock:
+            for token_id in dict.fromkeys(token_ids):
+                cached = self._orderbooks.get(token_id)
+                if cached and now - cached[0] < self.ORDERBOOK_TTL:
+                    self._orderbooks.move_to_end(token_id)
+                    books[token_id] = cached[2]
+                else:
+                    missing.append(token_id)
+        
+        for start in range(0, len(missing), self.ORDERBOOK_BATCH_SIZE):
+            batch = missing[start:start + self.ORDERBOOK_BATCH_SIZE]
+            resp = self._post(f"{self.CLOB_BASE}/books", [{"token_id": t} for t in batch])
+            if resp is None or resp.status_code != 200:
+                if resp is not None:
+                    logger.warning(f"Batch order book request failed: {resp.status_code}")
+                continue
+            try:
+                returned = orjson.loads(resp.content)
+            except orjson.JSONDecodeError as e:
+                logger.error(f"Bad batch order book response: {e}")
+                continue
+            for book in returned if isinstance(returned, list) else []:
+                token_id = book.get("asset_id") if isinstance(book, dict) else None
+                if token_id in batch:
+                    books[token_id] = book
+                    self._cache_orderbook(token_id, None, book)
+        
+        remaining = [t for t in missing if t not in books]
+        if remaining:
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENCY) as pool:
+                for token_id, book in zip(remaining, pool.map(self._get_orderbook_safe, remaining)):
+                    if book:
+                        books[token_id] = book
+        return books
+    
+    def _get_orderbook_safe(self, token_id: str) -> Optional[Dict]:
+        """get_orderbook, logging and swallowing per-token errors."""
+        try:
+            return self.get_orderbook(token_id)
+        except Exception as e:
+            logger.error(f"Error fetching orderbook for {token_id}: {e}")
+            return None
+    
+    def _cache_orderbook(self, token_id: str, etag: Optional[str], book: Dict):
+        with self._orderbooks_lock:
+            self._orderbooks[token_id] = (time.monotonic(), etag, book)
+            self._orderbooks.move_to_end(token_id)
+            while len(self._orderbooks) > self.ORDERBOOK_CACHE_SIZE:
+                self._orderbooks.popitem(last=False)
+
+
+# Shared across refreshes so connections and cached order books are reused
+_client: Optional[PolymarketClient] = None
+
+
+def get_client() -> PolymarketClient:
+    """Return the process-wide Polymarket client."""
+    global _client
+    if _client is None:
+        _client = PolymarketClient()
+    return _client
 
 
 # =============================================================================
@@ -100,19 +272,56 @@ CATEGORY_KEYWORDS = {
     ],
 }
 
+# Every keyword folded into one alternation, compiled once at import, so a
+# single scan of the text finds all categories' keywords. Longest keywords
+# come first, so a match at "ethereum" is reported as "ethereum", not "eth".
+# The leading word boundary keeps short keywords from matching mid-word
+# ("whether") while still allowing inflections ("wins", "elections").
+_KEYWORD_CATEGORY = {
+    kw: category
+    for category, keywords in CATEGORY_KEYWORDS.items()
+    for kw in keywords
+}
+_KEYWORD_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(_KEYWORD_CATEGORY, key=len, reverse=True))) + r")"
+)
+
+# findall never returns overlapping matches, so "ethereum" hides the "eth" it
+# starts with. Each match credits every keyword found at a word start inside
+# it ("ethereum" -> {"ethereum", "eth"}, "spacex" -> {"spacex", "space"}),
+# which is what substring matching counted.
+_KEYWORD_CREDITS = {
+    kw: frozenset(k for k in _KEYWORD_CATEGORY if re.search(r"\b" + re.escape(k), kw))
+    for kw in _KEYWORD_CATEGORY
+}
+
+# Keyword pairs where substring matching also counted a keyword found
+# mid-word inside another ("nfl" in "inflation"); word-boundary matching
+# drops these on purpose. Any other gap between the credits above and
+# substring matching would change categories, so the table is checked here.
+_MID_WORD_OVERLAPS = {("inflation", "nfl")}
+assert {
+    (kw, k)
+    for kw in _KEYWORD_CATEGORY
+    for k in _KEYWORD_CATEGORY
+    if k in kw and k not in _KEYWORD_CREDITS[kw]
+} == _MID_WORD_OVERLAPS, "category keyword overlaps changed; review _MID_WORD_OVERLAPS"
 
+
+@lru_cache(maxsize=8192)
 def detect_category(question: str, description: str = "") -> MarketCategory:
-    """Detect market category from text."""
+    """Detect market category from text. Cached, since refreshes re-see the same markets."""
     text = f"{question} {description}".lower()
     
-    scores = {}
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in text)
-        if score > 0:
-            scores[category] = score
+    # Score = number of distinct keywords of the category present
+    found = set()
+    for match in set(_KEYWORD_RE.findall(text)):
+        found |= _KEYWORD_CREDITS[match]
+    scores = Counter(_KEYWORD_CATEGORY[kw] for kw in found)
     
     if scores:
-        return max(scores, key=scores.get)
+        # Ties go to the category listed first in CATEGORY_KEYWORDS
+        return max(CATEGORY_KEYWORDS, key=lambda c: scores[c])
     return MarketCategory.OTHER
 
 
@@ -126,66 +335,80 @@ def score_liquidity(liquidity: float) -> float:
     IDEAL_LIQ = 50000
     
     if liquidity < MIN_LIQ:
-        return 0
+        return 0.0
     if liquidity >= IDEAL_LIQ:
-        return 100
+        return 100.0
     return ((liquidity - MIN_LIQ) / (IDEAL_LIQ - MIN_LIQ)) * 100
 
 
 def score_inefficiency(spread_pct: float) -> float:
     """Score market inefficiency (0-100). Higher = more edge potential."""
     if spread_pct > 10:
-        return 20  # Too illiquid
+        return 20.0  # Too illiquid
     if spread_pct < 0.5:
-        return 30  # Very efficient
+        return 30.0  # Very efficient
     if 1 <= spread_pct <= 5:
-        return 100  # Sweet spot
+        return 100.0  # Sweet spot
     if spread_pct < 1:
         return 30 + (spread_pct * 70)
     return 100 - ((spread_pct - 5) * 16)
 
 
+_RESEARCHABILITY_SCORE = {
+    MarketCategory.SPORTS: 95.0,
+    MarketCategory.POLITICS: 90.0,
+    MarketCategory.ECONOMICS: 90.0,
+    MarketCategory.CRYPTO: 85.0,
+    MarketCategory.SCIENCE: 70.0,
+    MarketCategory.ENTERTAINMENT: 60.0,
+    MarketCategory.OTHER: 40.0,
+}
+
+# Stable integer code per category (definition order) for array lookups
+_CATEGORY_CODE = {c: i for i, c in enumerate(MarketCategory)}
+_RESEARCHABILITY_BY_CODE = np.array(
+    [_RESEARCHABILITY_SCORE.get(c, 40.0) for c in _CATEGORY_CODE], np.float64
+)
+
+
 def score_researchability(category: MarketCategory) -> float:
     """Score how researchable a market is (0-100)."""
-    scores = {
-        MarketCategory.SPORTS: 95,
-        MarketCategory.POLITICS: 90,
-        MarketCategory.ECONOMICS: 90,
-        MarketCategory.CRYPTO: 85,
-        MarketCategory.LEGAL: 75,
-        MarketCategory.SCIENCE: 70,
-        MarketCategory.ENTERTAINMENT: 60,
-        MarketCategory.OTHER: 40,
-    }
-    return scores.get(category, 40)
+    return _RESEARCHABILITY_SCORE.get(category, 40.0)
 
 
-def score_timing(days: Optional[int]) -> float:
-    """Score time horizon (0-100). Best = 3-14 days out."""
-    if days is None:
-        return 50
+def _timing_score(days: int) -> float:
     if days < 1:
-        return 20
+        return 20.0
     if days < 3:
-        return 50
+        return 50.0
     if days <= 14:
-        return 90
+        return 90.0
     if days <= 30:
-        return 85
+        return 85.0
     if days <= 90:
-        return 70
-    return 40
+        return 70.0
+    return 40.0
+
 
+# score_timing for whole days 0..91; every day past 90 scores like 91
+_TIMING_MAX_DAY = 91
+_TIMING_LUT = tuple(_timing_score(d) for d in range(_TIMING_MAX_DAY + 1))
+_TIMING_LUT_ARR = np.array(_TIMING_LUT, np.float64)
 
-def calculate_edge_score(market: Market) -> float:
+
+def score_timing(days: Optional[int]) -> float:
+    """Score time horizon (0-100). Best = 3-14 days out."""
+    if days is None:
+        return 50.0
+    return _TIMING_LUT[min(max(days, 0), _TIMING_MAX_DAY)]
+
+
+# Edge score weights: liquidity, inefficiency, researchability, timing
+_W_LIQ, _W_EFF, _W_RES, _W_TIME = 0.25, 0.30, 0.25, 0.20
+
+
+def calculate_edge_score(market: MarketCore) -> float:
     """Calculate overall edge score (0-100) using weighted factors."""
-    weights = {
-        "liquidity": 0.25,
-        "inefficiency": 0.30,
-        "researchability": 0.25,
-        "timing": 0.20
-    }
-    
     liq_score = score_liquidity(market.liquidity)
     eff_score = score_inefficiency(market.spread_pct)
     res_score = score_researchability(market.category)
@@ -198,21 +421,97 @@ def calculate_edge_score(market: Market) -> float:
     
     # Weighted average
     return (
-        liq_score * weights["liquidity"] +
-        eff_score * weights["inefficiency"] +
-        res_score * weights["researchability"] +
-        time_score * weights["timing"]
+        liq_score * _W_LIQ +
+        eff_score * _W_EFF +
+        res_score * _W_RES +
+        time_score * _W_TIME
+    )
+
+
+def score_all(
+    liq: np.ndarray,
+    spread: np.ndarray,
+    cat_code: np.ndarray,
+    days: np.ndarray,
+    out: np.ndarray
+) -> np.ndarray:
+    """
+    Array kernel behind score_markets_batch.
+    
+    Takes float64 liquidity/spread arrays, integer category codes and whole
+    days until resolution (-1 for unknown). Fills out[:, 0..3] with the liquidity,
+    inefficiency, researchability and timing scores and returns edge scores.
+    Matches the scalar scoring functions exactly.
+    """
+    np.multiply(np.clip((liq - 1000) / 49000, 0, 1), 100, out=out[:, 0])
+    
+    # Conditions are checked in the same order as score_inefficiency
+    out[:, 1] = np.select(
+        [spread > 10, spread < 0.5, (spread >= 1) & (spread <= 5), spread < 1],
+        [20.0, 30.0, 100.0, 30 + spread * 70],
+        default=100 - (spread - 5) * 16
+    )
+    
+    np.take(_RESEARCHABILITY_BY_CODE, cat_code, out=out[:, 2])
+    
+    out[:, 3] = np.where(days < 0, 50.0, _TIMING_LUT_ARR[np.clip(days, 0, _TIMING_MAX_DAY)])
+    
+    return out[:, 0] * _W_LIQ + out[:, 1] * _W_EFF + out[:, 2] * _W_RES + out[:, 3] * _W_TIME
+
+
+def score_markets_batch(markets: List[MarketCore]) -> np.ndarray:
+    """
+    Vectorized calculate_edge_score over many markets.
+    
+    Writes the component and edge scores back onto each market and returns
+    the edge scores as an array aligned with markets.
+    """
+    n = len(markets)
+    if not n:
+        return np.empty(0, np.float64)
+    
+    liq = np.fromiter((m.liquidity for m in markets), np.float64, n)
+    spread = np.fromiter((m.spread_pct for m in markets), np.float64, n)
+    cat = np.fromiter((_CATEGORY_CODE[m.category] for m in markets), np.intp, n)
+    days = np.fromiter(
+        (-1 if m.days_until_resolution is None else m.days_until_resolution for m in markets),
+        np.intp, n
     )
+    
+    out = np.empty((n, 4), np.float64)
+    edge = score_all(liq, spread, cat, days, out)
+    
+    for market, (l, e, r, _), score in zip(markets, out.tolist(), edge.tolist()):
+        market.liquidity_score = l
+        market.efficiency_score = e
+        market.researchability_score = r
+        market.edge_score = score
+    
+    return edge
 
 
 # =============================================================================
 # MARKET PROCESSING
 # =============================================================================
 
+_ISO_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?Z")
+
+
+@lru_cache(maxsize=4096)
 def parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
-    """Parse datetime string."""
+    """Parse datetime string. Cached, since many markets share an end date."""
     if not dt_str:
         return None
+    m = _ISO_RE.fullmatch(dt_str)
+    if m:
+        year, month, day, hour, minute, second, frac = m.groups()
+        try:
+            return datetime(
+                int(year), int(month), int(day), int(hour), int(minute), int(second),
+                int(frac.ljust(6, "0")) if frac else 0, tzinfo=timezone.utc
+            )
+        except ValueError:
+            return None
     for fmt in ["%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d"]:
         try:
             return datetime.strptime(dt_str, fmt).replace(tzinfo=timezone.utc)
@@ -221,63 +520,69 @@ def parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
     return None
 
 
-def process_market(raw: Dict, client: PolymarketClient = None) -> Market:
-    """Convert raw API data to Market model."""
+def _json_list(value) -> List:
+    """Gamma returns some array fields as JSON-encoded strings; decode those."""
+    if isinstance(value, str):
+        try:
+            value = orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+def build_market(raw: Dict, now: Optional[datetime] = None) -> MarketCore:
+    """
+    Convert raw API data to a MarketCore, without order book data.
+    
+    Coerces every field to its declared type, since the result is turned
+    into a Market without validation.
+    
+    `now` is the reference time for days until resolution; pass one value
+    when building many markets so they all agree.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
     
     # Parse dates
     end_date = parse_datetime(raw.get("endDate"))
     days_until = None
     if end_date:
-        delta = end_date - datetime.now(timezone.utc)
+        delta = end_date - now
         days_until = max(0, delta.days)
     
     # Detect category
-    question = raw.get("question", "")
-    description = raw.get("description", "")
+    question = raw.get("question") or ""
+    description = raw.get("description") or ""
     category = detect_category(question, description)
     
     # Parse tokens
-    outcomes = raw.get("outcomes", ["Yes", "No"])
-    prices = raw.get("outcomePrices", [])
-    token_ids = raw.get("clobTokenIds", [])
-    
-    tokens = []
-    for i, outcome in enumerate(outcomes):
-        tokens.append(Token(
-            token_id=token_ids[i] if i < len(token_ids) else "",
-            outcome=outcome,
-            price=float(prices[i]) if i < len(prices) else 0.5
-        ))
-    
-    # Calculate spread if we have order book data
-    spread_pct = 0.0
-    if client and tokens and tokens[0].token_id:
-        orderbook = client.get_orderbook(tokens[0].token_id)
-        if orderbook:
-            bids = orderbook.get("bids", [])
-            asks = orderbook.get("asks", [])
-            if bids and asks:
-                best_bid = float(bids[0].get("price", 0))
-                best_ask = float(asks[0].get("price", 0))
-                midpoint = (best_bid + best_ask) / 2
-                if midpoint > 0:
-                    spread_pct = ((best_ask - best_bid) / midpoint) * 100
-                tokens[0].best_bid = best_bid
-                tokens[0].best_ask = best_ask
+    outcomes = _json_list(raw.get("outcomes", ["Yes", "No"]))
+    prices = _json_list(raw.get("outcomePrices", []))
+    token_ids = _json_list(raw.get("clobTokenIds", []))
+    
+    tokens = [
+        TokenCore(
+            token_id=str(token_id) if token_id else "",
+            outcome=str(outcome),
+            price=float(price) if price is not None else 0.5
+        )
+        for outcome, price, token_id in zip_longest(outcomes, prices, token_ids)
+        if outcome is not None
+    ]
     
     # Build URL
     slug = raw.get("slug", "")
     url = f"https://polymarket.com/event/{slug}" if slug else ""
     
-    market = Market(
-        market_id=raw.get("id", ""),
-        condition_id=raw.get("conditionId", ""),
+    return MarketCore(
+        market_id=str(raw.get("id", "")),
+        condition_id=raw.get("conditionId") or "",
         question=question,
         description=description[:500],
         category=category,
-        tags=raw.get("tags", []) or [],
+        tags=[t for t in raw.get("tags") or [] if isinstance(t, str)],
         current_price=tokens[0].price if tokens else 0.5,
-        spread_pct=spread_pct,
+        spread_pct=0.0,
         volume_24h=float(raw.get("volume24hr", 0) or 0),
         liquidity=float(raw.get("liquidity", 0) or 0),
         end_date=str(end_date) if end_date else None,
@@ -285,11 +590,44 @@ def process_market(raw: Dict, client: PolymarketClient = None) -> Market:
         tokens=tokens,
         polymarket_url=url
     )
-    
-    # Calculate edge score
+
+
+def apply_orderbook(market: MarketCore, orderbook: Optional[Dict]) -> None:
+    """Set spread and best bid/ask on the market's first token from its order book."""
+    if not orderbook:
+        return
+    bids = orderbook.get("bids", [])
+    asks = orderbook.get("asks", [])
+    if bids and asks:
+        best_bid = float(bids[0].get("price", 0))
+        best_ask = float(asks[0].get("price", 0))
+        midpoint = (best_bid + best_ask) / 2
+        if midpoint > 0:
+            market.spread_pct = ((best_ask - best_bid) / midpoint) * 100
+        market.tokens[0].best_bid = best_bid
+        market.tokens[0].best_ask = best_ask
+
+
+def process_market(
+    raw: Dict,
+    client: PolymarketClient = None,
+    now: Optional[datetime] = None
+) -> Market:
+    """Convert raw API data to Market model."""
+    market = build_market(raw, now)
+    if client and market.tokens and market.tokens[0].token_id:
+        apply_orderbook(market, client.get_orderbook(market.tokens[0].token_id))
     market.edge_score = calculate_edge_score(market)
-    
-    return market
+    return market.to_pydantic()
+
+
+def _build_market_safe(raw: Dict, now: Optional[datetime] = None) -> Optional[MarketCore]:
+    """build_market, logging and swallowing per-market errors."""
+    try:
+        return build_market(raw, now)
+    except Exception as e:
+        logger.error(f"Error processing market: {e}")
+        return None
 
 
 # =============================================================================
@@ -312,21 +650,21 @@ def ingest_markets(
     Returns:
         List of Market objects sorted by edge score
     """
-    client = PolymarketClient()
+    client = get_client()
     
     logger.info(f"Fetching markets (max={max_markets}, min_vol=${min_volume})")
     
-    # Fetch raw markets
+    # Fetch raw markets: all pages up to max_markets in parallel
+    page_size = 100
+    offsets = range(0, max(max_markets, 0), page_size)
     all_raw = []
-    offset = 0
-    while len(all_raw) < max_markets:
-        batch = client.get_markets(limit=100, offset=offset)
-        if not batch:
-            break
-        all_raw.extend(batch)
-        if len(batch) < 100:
-            break
-        offset += 100
+    if offsets:
+        with ThreadPoolExecutor(max_workers=min(len(offsets), 4)) as pool:
+            pages = pool.map(partial(client.get_markets, page_size), offsets)
+            for batch in pages:
+                all_raw.extend(batch)
+                if len(batch) < page_size:
+                    break  # Last page; later offsets are empty
     
     logger.info(f"Fetched {len(all_raw)} raw markets")
     
@@ -334,20 +672,27 @@ def ingest_markets(
     filtered = [m for m in all_raw if float(m.get("volume24hr", 0) or 0) >= min_volume]
     logger.info(f"After volume filter: {len(filtered)} markets")
     
-    # Process markets
-    markets = []
-    for i, raw in enumerate(filtered[:max_markets]):
-        if i % 20 == 0:
-            logger.info(f"Processing {i}/{len(filtered[:max_markets])}...")
-        
-        try:
-            market = process_market(raw, client if fetch_orderbooks else None)
-            markets.append(market)
-        except Exception as e:
-            logger.error(f"Error processing market: {e}")
+    # Build markets first (CPU only), then fan out order book requests
+    to_process = filtered[:max_markets]
+    logger.info(f"Processing {len(to_process)} markets...")
+    now = datetime.now(timezone.utc)
+    markets = [m for m in (_build_market_safe(raw, now) for raw in to_process) if m is not None]
+    
+    if fetch_orderbooks:
+        pending = [m for m in markets if m.tokens and m.tokens[0].token_id]
+        logger.info(f"Fetching {len(pending)} order books...")
+        books = client.get_orderbooks([m.tokens[0].token_id for m in pending])
+        for market in pending:
+            apply_orderbook(market, books.get(market.tokens[0].token_id))
+    
+    edge = score_markets_batch(markets)
+    
+    # Sort by edge score (descending; stable, so ties keep API order)
+    markets = [markets[i] for i in np.argsort(-edge, kind="stable").tolist()]
     
-    # Sort by edge score
-    markets.sort(key=lambda m: m.edge_score, reverse=True)
+    # Convert to API models once, at the end (no validation: build_market
+    # already coerced every field, see MarketCore)
+    markets = [m.to_pydantic() for m in markets]
     
     logger.info(f"Processed {len(markets)} markets")
     return markets
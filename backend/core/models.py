@@ -7,6 +7,8 @@ Pydantic v2 compatible.
 
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
+from functools import cached_property
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 
@@ -74,6 +76,72 @@ class Market(BaseModel):
     
     # Links
     polymarket_url: str = ""
+    
+    @cached_property
+    def question_lower(self) -> str:
+        """Lower-cased question, computed once for keyword and date matching."""
+        return self.question.lower()
+    
+    @cached_property
+    def tokens_by_outcome(self) -> Dict[str, Token]:
+        """Tokens keyed by outcome name (first token wins on duplicates)."""
+        return {t.outcome: t for t in reversed(self.tokens)}
+
+
+@dataclass(slots=True)
+class TokenCore:
+    """Unvalidated Token used while ingesting; see to_pydantic()."""
+    token_id: str
+    outcome: str
+    price: float
+    best_bid: float = 0.0
+    best_ask: float = 0.0
+    
+    def to_pydantic(self) -> Token:
+        return Token.model_construct(
+            token_id=self.token_id,
+            outcome=self.outcome,
+            price=self.price,
+            best_bid=self.best_bid,
+            best_ask=self.best_ask
+        )
+
+
+@dataclass(slots=True)
+class MarketCore:
+    """
+    Unvalidated Market used while ingesting.
+    
+    Plain slotted mirror of Market, cheap to build and mutate while parsing
+    and scoring many markets. Converted once with to_pydantic() at the end.
+    
+    to_pydantic() skips validation (model_construct), so whoever fills a
+    MarketCore must keep the field types exact: str ids and text, float
+    prices/volumes/scores, int days, a MarketCategory, and a list of str tags.
+    """
+    market_id: str
+    question: str
+    condition_id: str = ""
+    description: str = ""
+    category: MarketCategory = MarketCategory.OTHER
+    tags: List[str] = field(default_factory=list)
+    current_price: float = 0.5
+    spread_pct: float = 0.0
+    volume_24h: float = 0.0
+    liquidity: float = 0.0
+    end_date: Optional[str] = None
+    days_until_resolution: Optional[int] = None
+    edge_score: float = 0.0
+    liquidity_score: float = 0.0
+    efficiency_score: float = 0.0
+    researchability_score: float = 0.0
+    tokens: List[TokenCore] = field(default_factory=list)
+    polymarket_url: str = ""
+    
+    def to_pydantic(self) -> Market:
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["tokens"] = [t.to_pydantic() for t in self.tokens]
+        return Market.model_construct(**data)
 
 
 class EdgeOpportunity(BaseModel):
@@ -7,13 +7,22 @@ Currently uses heuristics - designed to be extended with real data sources.
 
 from typing import List, Optional
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import logging
+import re
 
 from .models import Market, Prediction, MarketCategory
 
 logger = logging.getLogger(__name__)
 
 
+def _keyword_regex(keywords: List[str]) -> re.Pattern:
+    """Compile lower-case keywords into one pattern matching at word starts."""
+    return re.compile(
+        r"\b(?:" + "|".join(map(re.escape, sorted(keywords, key=len, reverse=True))) + r")"
+    )
+
+
 # =============================================================================
 # BASE AGENT
 # =============================================================================
@@ -61,6 +70,14 @@ class PoliticsAgent(ResearchAgent):
     
     KEYWORDS = ["election", "president", "senate", "congress", "trump", "biden", 
                 "republican", "democrat", "governor", "vote"]
+    _KW_RE = _keyword_regex(KEYWORDS)
+    
+    _BASE = {
+        "confidence": 50.0,  # Low without real data
+        "reasoning": "Placeholder analysis. Would use polling data, historical patterns, and expert forecasts.",
+    }
+    _RISKS = ("Polling error", "Late-breaking news", "Turnout uncertainty")
+    _CATALYSTS = ("Debates", "Major endorsements", "News events")
     
     def __init__(self):
         super().__init__("PoliticsAgent", [MarketCategory.POLITICS])
@@ -68,8 +85,7 @@ class PoliticsAgent(ResearchAgent):
     def can_analyze(self, market: Market) -> bool:
         if market.category == MarketCategory.POLITICS:
             return True
-        q = market.question.lower()
-        return any(kw in q for kw in self.KEYWORDS)
+        return self._KW_RE.search(market.question_lower) is not None
     
     def analyze(self, market: Market) -> Prediction:
         # Placeholder: In production, fetch polls and expert forecasts
@@ -88,20 +104,19 @@ class PoliticsAgent(ResearchAgent):
             direction = "buy_no"
             strength = "strong" if edge < -0.1 else "moderate"
         
-        return Prediction(
+        return Prediction.model_construct(
             market_id=market.market_id,
             market_question=market.question,
             predicted_probability=predicted,
             current_price=current,
             edge=edge,
-            confidence=50,  # Low without real data
-            confidence_low=max(0, predicted - 0.15),
-            confidence_high=min(1, predicted + 0.15),
+            confidence_low=max(0.0, predicted - 0.15),
+            confidence_high=min(1.0, predicted + 0.15),
             direction=direction,
             strength=strength,
-            reasoning="Placeholder analysis. Would use polling data, historical patterns, and expert forecasts.",
-            key_risks=["Polling error", "Late-breaking news", "Turnout uncertainty"],
-            catalysts=["Debates", "Major endorsements", "News events"]
+            key_risks=list(self._RISKS),
+            catalysts=list(self._CATALYSTS),
+            **self._BASE
         )
 
 
@@ -117,6 +132,17 @@ class SportsAgent(ResearchAgent):
     
     KEYWORDS = ["nfl", "nba", "mlb", "nhl", "super bowl", "championship", 
                 "playoffs", "finals", "game", "match", "win"]
+    _KW_RE = _keyword_regex(KEYWORDS)
+    
+    _BASE = {
+        "edge": 0.0,
+        "confidence": 40.0,
+        "direction": "hold",
+        "strength": "weak",
+        "reasoning": "Would use team statistics, injury reports, and Vegas lines.",
+    }
+    _RISKS = ("Injuries", "Weather", "Unexpected events")
+    _CATALYSTS = ("Injury updates", "Lineup announcements")
     
     def __init__(self):
         super().__init__("SportsAgent", [MarketCategory.SPORTS])
@@ -124,26 +150,21 @@ class SportsAgent(ResearchAgent):
     def can_analyze(self, market: Market) -> bool:
         if market.category == MarketCategory.SPORTS:
             return True
-        q = market.question.lower()
-        return any(kw in q for kw in self.KEYWORDS)
+        return self._KW_RE.search(market.question_lower) is not None
     
     def analyze(self, market: Market) -> Prediction:
         current = market.current_price
         
-        return Prediction(
+        return Prediction.model_construct(
             market_id=market.market_id,
             market_question=market.question,
             predicted_probability=current,
             current_price=current,
-            edge=0,
-            confidence=40,
-            confidence_low=max(0, current - 0.2),
-            confidence_high=min(1, current + 0.2),
-            direction="hold",
-            strength="weak",
-            reasoning="Would use team statistics, injury reports, and Vegas lines.",
-            key_risks=["Injuries", "Weather", "Unexpected events"],
-            catalysts=["Injury updates", "Lineup announcements"]
+            confidence_low=max(0.0, current - 0.2),
+            confidence_high=min(1.0, current + 0.2),
+            key_risks=list(self._RISKS),
+            catalysts=list(self._CATALYSTS),
+            **self._BASE
         )
 
 
@@ -159,6 +180,17 @@ class CryptoAgent(ResearchAgent):
     
     KEYWORDS = ["bitcoin", "btc", "ethereum", "eth", "crypto", "solana", 
                 "sol", "token", "halving"]
+    _KW_RE = _keyword_regex(KEYWORDS)
+    
+    _BASE = {
+        "edge": 0.0,
+        "confidence": 35.0,
+        "direction": "hold",
+        "strength": "weak",
+        "reasoning": "Would use price technicals, on-chain metrics, and sentiment.",
+    }
+    _RISKS = ("Volatility", "Regulatory news", "Market manipulation")
+    _CATALYSTS = ("ETF decisions", "Protocol upgrades", "Macro events")
     
     def __init__(self):
         super().__init__("CryptoAgent", [MarketCategory.CRYPTO])
@@ -166,26 +198,21 @@ class CryptoAgent(ResearchAgent):
     def can_analyze(self, market: Market) -> bool:
         if market.category == MarketCategory.CRYPTO:
             return True
-        q = market.question.lower()
-        return any(kw in q for kw in self.KEYWORDS)
+        return self._KW_RE.search(market.question_lower) is not None
     
     def analyze(self, market: Market) -> Prediction:
         current = market.current_price
         
-        return Prediction(
+        return Prediction.model_construct(
             market_id=market.market_id,
             market_question=market.question,
             predicted_probability=current,
             current_price=current,
-            edge=0,
-            confidence=35,
-            confidence_low=max(0, current - 0.25),
-            confidence_high=min(1, current + 0.25),
-            direction="hold",
-            strength="weak",
-            reasoning="Would use price technicals, on-chain metrics, and sentiment.",
-            key_risks=["Volatility", "Regulatory news", "Market manipulation"],
-            catalysts=["ETF decisions", "Protocol upgrades", "Macro events"]
+            confidence_low=max(0.0, current - 0.25),
+            confidence_high=min(1.0, current + 0.25),
+            key_risks=list(self._RISKS),
+            catalysts=list(self._CATALYSTS),
+            **self._BASE
         )
 
 
@@ -201,6 +228,17 @@ class EconomicsAgent(ResearchAgent):
     
     KEYWORDS = ["fed", "interest rate", "inflation", "gdp", "unemployment", 
                 "recession", "cpi", "fomc"]
+    _KW_RE = _keyword_regex(KEYWORDS)
+    
+    _BASE = {
+        "edge": 0.0,
+        "confidence": 60.0,
+        "direction": "hold",
+        "strength": "weak",
+        "reasoning": "Would use FRED data, Fed communications, and futures implied probabilities.",
+    }
+    _RISKS = ("Data revisions", "Fed pivot", "External shocks")
+    _CATALYSTS = ("FOMC meetings", "CPI releases", "Jobs reports")
     
     def __init__(self):
         super().__init__("EconomicsAgent", [MarketCategory.ECONOMICS])
@@ -208,32 +246,37 @@ class EconomicsAgent(ResearchAgent):
     def can_analyze(self, market: Market) -> bool:
         if market.category == MarketCategory.ECONOMICS:
             return True
-        q = market.question.lower()
-        return any(kw in q for kw in self.KEYWORDS)
+        return self._KW_RE.search(market.question_lower) is not None
     
     def analyze(self, market: Market) -> Prediction:
         current = market.current_price
         
-        return Prediction(
+        return Prediction.model_construct(
             market_id=market.market_id,
             market_question=market.question,
             predicted_probability=current,
             current_price=current,
-            edge=0,
-            confidence=60,
-            confidence_low=max(0, current - 0.1),
-            confidence_high=min(1, current + 0.1),
-            direction="hold",
-            strength="weak",
-            reasoning="Would use FRED data, Fed communications, and futures implied probabilities.",
-            key_risks=["Data revisions", "Fed pivot", "External shocks"],
-            catalysts=["FOMC meetings", "CPI releases", "Jobs reports"]
+            confidence_low=max(0.0, current - 0.1),
+            confidence_high=min(1.0, current + 0.1),
+            key_risks=list(self._RISKS),
+            catalysts=list(self._CATALYSTS),
+            **self._BASE
         )
 
 
 class GeneralAgent(ResearchAgent):
     """Fallback agent for uncategorized markets."""
     
+    _BASE = {
+        "edge": 0.0,
+        "confidence": 30.0,
+        "direction": "hold",
+        "strength": "weak",
+        "reasoning": "Uncategorized market. Requires manual research.",
+    }
+    _RISKS = ("Unknown factors",)
+    _CATALYSTS = ("Varies",)
+    
     def __init__(self):
         super().__init__("GeneralAgent", [MarketCategory.OTHER])
     
@@ -243,20 +286,16 @@ class GeneralAgent(ResearchAgent):
     def analyze(self, market: Market) -> Prediction:
         current = market.current_price
         
-        return Prediction(
+        return Prediction.model_construct(
             market_id=market.market_id,
             market_question=market.question,
             predicted_probability=current,
             current_price=current,
-            edge=0,
-            confidence=30,
-            confidence_low=max(0, current - 0.3),
-            confidence_high=min(1, current + 0.3),
-            direction="hold",
-            strength="weak",
-            reasoning="Uncategorized market. Requires manual research.",
-            key_risks=["Unknown factors"],
-            catalysts=["Varies"]
+            confidence_low=max(0.0, current - 0.3),
+            confidence_high=min(1.0, current + 0.3),
+            key_risks=list(self._RISKS),
+            catalysts=list(self._CATALYSTS),
+            **self._BASE
         )
 
 
@@ -276,36 +315,58 @@ class AgentOrchestrator:
             EconomicsAgent(),
             GeneralAgent()  # Fallback
         ]
+        self._general = self.agents[-1]
+        
+        # Category -> specialist agent, so categorized markets skip the keyword scan
+        self._by_category = {}
+        for agent in self.agents[:-1]:
+            for category in agent.categories:
+                self._by_category.setdefault(category, agent)
     
     def find_agent(self, market: Market) -> ResearchAgent:
         """Find the best agent for a market."""
+        agent = self._by_category.get(market.category)
+        if agent is not None:
+            return agent
+        # No specialist for this category: fall back to keyword matching
         for agent in self.agents:
             if agent.can_analyze(market):
                 return agent
-        return self.agents[-1]  # GeneralAgent fallback
+        return self._general
     
     def research_market(self, market: Market) -> Prediction:
         """Research a single market."""
         agent = self.find_agent(market)
         return agent.research(market)
     
-    def research_markets(self, markets: List[Market], min_edge: float = 0.0) -> List[Prediction]:
+    def research_markets(
+        self,
+        markets: List[Market],
+        min_edge: float = 0.0,
+        max_workers: int = 8,
+        use_processes: bool = False
+    ) -> List[Prediction]:
         """
-        Research multiple markets.
+        Research multiple markets concurrently.
         
         Args:
             markets: List of markets to research
             min_edge: Minimum absolute edge to include
+            max_workers: Number of concurrent workers
+            use_processes: Use worker processes (each with its own orchestrator)
+                instead of threads, for CPU-heavy agents
         
         Returns:
             List of predictions sorted by absolute edge
         """
-        predictions = []
+        if use_processes:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+                results = list(pool.map(_research_in_worker, markets))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(self.research_market, markets))
         
-        for market in markets:
-            pred = self.research_market(market)
-            if pred and abs(pred.edge) >= min_edge:
-                predictions.append(pred)
+        predictions = [p for p in results if p and abs(p.edge) >= min_edge]
         
         # Sort by absolute edge
         predictions.sort(key=lambda p: abs(p.edge), reverse=True)
@@ -313,3 +374,16 @@ class AgentOrchestrator:
         logger.info(f"Generated {len(predictions)} predictions")
         
         return predictions
+
+
+# Per-process orchestrator for research_markets(use_processes=True)
+_worker_orchestrator: Optional[AgentOrchestrator] = None
+
+
+def _init_worker() -> None:
+    global _worker_orchestrator
+    _worker_orchestrator = AgentOrchestrator()
+
+
+def _research_in_worker(market: Market) -> Optional[Prediction]:
+    return _worker_orchestrator.research_market(market)
@@ -9,6 +9,7 @@ Run with:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import logging
 
 from api import router
@@ -23,7 +24,8 @@ logging.basicConfig(
 app = FastAPI(
     title="Polymarket Edge Finder",
     description="Find trading edges in prediction markets",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # Faster JSON encoding than stdlib json
 )
 
 # CORS - allow frontend to connect